@@ -1,9 +1,12 @@
+import functools
 import pygame
 import random
 from pygame.locals import *
 import sys
+import time
 import os
-from typing import List, Tuple
+from collections import deque
+from typing import Deque, Dict, List, Tuple
 
 # Constants: Sizes in pixels / speeds in pixels per tick
 # BIRD CONSTANTS
@@ -16,11 +19,15 @@ JUMP_VELOCITY = 8
 PIPE_SPEED = 5
 PIPE_WIDTH = 150
 PIPE_GAP = 165
+PIPE_POOL_SIZE = 4 # At most three pipes are on screen at once
 
 # BACKGROUND / GAME CONSTANTS
 SCREEN_WIDTH = 600
 SCREEN_HEIGHT = 800
+PIPE_HITBOX_BOTTOM = SCREEN_HEIGHT - 3 # The lower pipe hitbox stops 3px above the bottom of the screen
 FPS = 30
+DT = 1 / FPS # Fixed simulation step, the loop is paced to FPS
+GRAVITY_PER_TICK = GRAVITY_ACCEL * DT
 BACKGROUND_WIDTH = 880
 BACKGROUND_SPEED = 3
 
@@ -34,67 +41,42 @@ class Bird:
     def __init__(self):
         self.x, self.y = START_COORDS
         self.w, self.h = BIRD_SIZE
-        self.accel = GRAVITY_ACCEL
         self.vel = JUMP_VELOCITY
-        self.time_ini = 0
-        self.time_elapsed = 0.0
+        self.air_ticks = 0 # Ticks since the last jump
         self.score = 0
 
-    def time_init(self) -> None:
-        """Initializes the timer when the bird jumps."""
-        self.time_ini = pygame.time.get_ticks()
-
-    def time_diff(self) -> None:
-        """Calculates the time since the last jump."""
-        self.time_elapsed = (pygame.time.get_ticks() - self.time_ini) / 1000
-
     def gravity(self) -> None:
         """Applies gravity to update vertical velocity and position."""
-        self.vel = self.vel - (self.accel * self.time_elapsed)
-        self.y = self.y - self.vel
+        self.air_ticks += 1
+        self.vel -= GRAVITY_PER_TICK * self.air_ticks
+        self.y -= self.vel
 
     def jump(self) -> None:
         """Resets jump velocity and timer."""
-        self.time_init()
         self.vel = JUMP_VELOCITY
-
-    def draw_bird(self, surface: pygame.Surface, image: pygame.Surface) -> None:
-        """Draws the bird on the given surface."""
-        surface.blit(image, [self.x - 10, self.y - 3])
-
-    def get_rect(self) -> pygame.Rect:
-        """Returns the bounding rectangle for collision detection."""
-        return pygame.Rect(self.x, self.y, self.w, self.h)
+        self.air_ticks = 0
 
 
 class Pipe:
     """Represents an obstacle pipe pair in the game."""
 
-    def __init__(self, x: int):
-        self.x, self.y = (x, 0)
-        self.w, self.h = (PIPE_WIDTH, random.randint(100, 550))
+    def __init__(self):
+        self.y = 0
+        self.w = PIPE_WIDTH
         self.gap = PIPE_GAP
+        # The position and height are set by reset() when the pipe is taken from the pool
+
+    def reset(self, x: int) -> None:
+        """Places the pipe at x with a new random height so it can be reused."""
+        self.x = x
+        self.h = random.randint(100, 550)
+        self.gap_bottom = self.h + self.gap - 3  # The lower hitbox starts 3px above the gap
         self.cleared = False  # True if bird passed through and scored
 
     def move(self) -> None:
         """Moves the pipes to the left."""
         self.x -= PIPE_SPEED
 
-    def draw_pipe_upper(self, surface: pygame.Surface, image: pygame.Surface) -> None:
-        """Draw upper pipe on a given surface."""
-        surface.blit(image, [self.x - 8, self.h - 552]) # Draw upper pipe adjusting the image to the hitbox
-
-    def draw_pipe_lower(self, surface: pygame.Surface, image: pygame.Surface) -> None:
-        """Draw lower pipe on a given surface."""
-        surface.blit(image, [self.x - 8, self.h + self.gap - 28]) # Draw lower pipe adjusting the image to the hitbox
-
-    def get_rect(self) -> Tuple[pygame.Rect, pygame.Rect]:
-        """Returns the bounding rectangles for upper and lower pipes for collision detection."""
-        return (
-            pygame.Rect(self.x, self.y, self.w, self.h),
-            pygame.Rect(self.x, self.h + self.gap - 3, self.w, SCREEN_HEIGHT - (self.h + self.gap))
-        )
-
 
 class Background:
     """Represents the scrolling background."""
@@ -107,9 +89,50 @@ class Background:
         """Moves the background to create a scrolling effect."""
         self.x -= BACKGROUND_SPEED
 
-    def draw_background(self, surface: pygame.Surface, image: pygame.Surface, x: int, y: int) -> None:
-        """Draws the background on a given surface."""
-        surface.blit(image, [x, y])
+
+def trim_image(image: pygame.Surface) -> Tuple[pygame.Surface, Tuple[int, int]]:
+    """Crops the fully transparent border of an image, returning the cropped image and its offset."""
+    bounds = image.get_bounding_rect()
+    return image.subsurface(bounds).copy(), bounds.topleft
+
+
+def blit_batch(surface: pygame.Surface, sequence: List[Tuple[pygame.Surface, Tuple[int, int]]]) -> None:
+    """Draws a sequence of (image, position) pairs on a surface in a single call."""
+    if hasattr(surface, "fblits"):
+        surface.fblits(sequence) # pygame-ce fast path
+    else:
+        surface.blits(sequence, doreturn=0)
+
+
+_font_cache: Dict[Tuple[str, int], pygame.font.Font] = {}
+
+
+def _get_font(font_name: str, size: int) -> pygame.font.Font:
+    """Returns the Font for a name and size, loading it on first use."""
+    key = (font_name, size)
+    if key not in _font_cache:
+        _font_cache[key] = pygame.font.Font(font_name, size)
+    return _font_cache[key]
+
+
+@functools.lru_cache(maxsize=128)
+def _render_text(
+    text: str, size: int, text_color: Tuple[int, int, int], outline_color: Tuple[int, int, int],
+    font_name: str, outline_thickness: int
+) -> pygame.Surface:
+    """Renders outlined text once onto a transparent surface and caches it."""
+    font = _get_font(font_name, size)
+    outline_surf = font.render(text, True, outline_color)
+    width, height = outline_surf.get_size()
+    outlined = pygame.Surface((width + 2 * outline_thickness, height + 2 * outline_thickness), SRCALPHA)
+    offsets = [-outline_thickness, 0, outline_thickness]
+    blit_batch(outlined, [
+        (outline_surf, (outline_thickness + dx, outline_thickness + dy))
+        for dx in offsets for dy in offsets if dx != 0 or dy != 0
+    ]) # The same outline render shifted in all 8 directions
+
+    outlined.blit(font.render(text, True, text_color), (outline_thickness, outline_thickness))
+    return outlined
 
 
 def draw_text_outline(
@@ -118,31 +141,26 @@ def draw_text_outline(
     font_name: str = 'freesansbold.ttf', outline_thickness: int = 1
 ) -> None:
     """Draws text with an outline."""
-    font = pygame.font.Font(font_name, size)
-    for dx in [-outline_thickness, 0, outline_thickness]:
-        for dy in [-outline_thickness, 0, outline_thickness]:
-            if dx != 0 or dy != 0:
-                outline_surf = font.render(text, True, outline_color)
-                outline_rect = outline_surf.get_rect(center=(position[0] + dx, position[1] + dy))
-                surface.blit(outline_surf, outline_rect)
+    text_surf = _render_text(text, size, text_color, outline_color, font_name, outline_thickness)
+    surface.blit(text_surf, text_surf.get_rect(center=position))
 
-    text_surf = font.render(text, True, text_color)
-    text_rect = text_surf.get_rect(center=position)
-    surface.blit(text_surf, text_rect)
 
-
-def event_handler(game_state: str, players: List[Bird], pipes: List[Pipe]) -> str:
+def event_handler(game_state: str, players: List[Bird], pipes: Deque[Pipe], spare_pipes: List[Pipe]) -> str:
     """Handles user inputs and game state transitions."""
-    for event in pygame.event.get():
+    for event in pygame.event.get([pygame.KEYDOWN, pygame.QUIT]):
+        if event.type == pygame.QUIT:
+            return "QUIT"
+
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE:
                 if game_state == "MENU":
                     players.clear() # Reset the players and pipes when game is over
+                    spare_pipes.extend(pipes) # Return the last game's pipes to the pool
                     pipes.clear()
                     players.append(Bird())
-                    pipes.append(Pipe(610))
-                    for player in players:
-                        player.time_init()
+                    pipe = spare_pipes.pop()
+                    pipe.reset(610)
+                    pipes.append(pipe)
                     return "PLAY"
 
                 elif game_state == "PLAY":
@@ -152,12 +170,21 @@ def event_handler(game_state: str, players: List[Bird], pipes: List[Pipe]) -> st
             elif event.key == pygame.K_r and game_state == "DEAD":
                 return "MENU"
 
-            elif event.key == pygame.K_q or event.type == QUIT:
+            elif event.key == pygame.K_q:
                 return "QUIT"
 
     return game_state
 
 
+def wait_for_deadline(deadline: float) -> float:
+    """Sleeps until the frame deadline and returns the next one, skipping frames that were already missed."""
+    now = time.perf_counter()
+    if now < deadline:
+        time.sleep(deadline - now)
+        return deadline + DT
+    return deadline + DT * ((now - deadline) // DT + 1) # Running behind: realign instead of rushing to catch up
+
+
 def resource_path(relative_path: str) -> str:
     """Returns absolute path to resource, compatible with PyInstaller."""
     try:
@@ -171,28 +198,43 @@ def resource_path(relative_path: str) -> str:
 def main() -> None:
     """Main game loop and state management."""
     players = []
-    pipes = []
+    pipes = deque()
+    spare_pipes = [Pipe() for _ in range(PIPE_POOL_SIZE)]
     game_state = "MENU"
 
     pygame.init()
+    pygame.event.set_blocked(None) # Only queue the events the game reacts to
+    pygame.event.set_allowed([pygame.KEYDOWN, pygame.QUIT])
     pygame.display.set_caption('FLAPPY BIRD')
-    clock = pygame.time.Clock()
+    next_deadline = time.perf_counter() + DT
     display_surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 
     # Load resources
     bg_image = pygame.image.load(resource_path("Images/bg_resize.png")).convert()
-    bird_image = pygame.image.load(resource_path("Images/bird_resize.png")).convert_alpha()
-    pipe_lower = pygame.image.load(resource_path("Images/pipe_lower.png")).convert_alpha()
-    pipe_upper = pygame.image.load(resource_path("Images/pipe_upper.png")).convert_alpha()
+    if bg_image.get_size() != (BACKGROUND_WIDTH, SCREEN_HEIGHT):
+        bg_image = pygame.transform.scale(bg_image, (BACKGROUND_WIDTH, SCREEN_HEIGHT))
+    # Drop transparent margins so blits only copy visible pixels, folding the crop into the draw offsets
+    bird_image, (bird_dx, bird_dy) = trim_image(pygame.image.load(resource_path("Images/bird_resize.png")).convert_alpha())
+    pipe_lower, (lower_dx, lower_dy) = trim_image(pygame.image.load(resource_path("Images/pipe_lower.png")).convert_alpha())
+    pipe_upper, (upper_dx, upper_dy) = trim_image(pygame.image.load(resource_path("Images/pipe_upper.png")).convert_alpha())
+    # Offsets that line the images up with the hitboxes
+    bird_dx, bird_dy = bird_dx - 10, bird_dy - 3
+    lower_dx, lower_dy = lower_dx - 8, lower_dy - 28
+    upper_dx, upper_dy = upper_dx - 8, upper_dy - 552
+    # Horizontal extent of the drawn pipe images relative to the hitbox, used to cull off-screen pipes
+    pipe_draw_left = min(upper_dx, lower_dx)
+    pipe_draw_right = max(upper_dx + pipe_upper.get_width(), lower_dx + pipe_lower.get_width())
     background = Background()
 
     while game_state != "QUIT":
-        game_state = event_handler(game_state, players, pipes)
+        game_state = event_handler(game_state, players, pipes, spare_pipes)
 
         if game_state == "MENU":
             # Draw scrolling background
-            background.draw_background(display_surface, bg_image, background.x, background.y)
-            background.draw_background(display_surface, bg_image, background.x + BACKGROUND_WIDTH, background.y)
+            blit_batch(display_surface, [
+                (bg_image, (bg_x, background.y)) for bg_x in (background.x, background.x + BACKGROUND_WIDTH)
+                if -BACKGROUND_WIDTH < bg_x < SCREEN_WIDTH
+            ])
             background.move()
             draw_text_outline(display_surface, "WELCOME TO FLAPPY BIRD", 36, (SCREEN_WIDTH//2, 300), WHITE)
             draw_text_outline(display_surface, "Press SPACE to start", 24, (SCREEN_WIDTH//2, 450), WHITE)
@@ -201,39 +243,58 @@ def main() -> None:
         elif game_state == "PLAY":
             # Generate new pipes when they reach the half point of the screen
             if pipes[-1].x <= 250:
-                pipes.append(Pipe(610))
-            pipes = [pipe for pipe in pipes if pipe.x + pipe.w > 0] # Delete pipes that left the screen
+                pipe = spare_pipes.pop()
+                pipe.reset(610)
+                pipes.append(pipe)
+            if pipes[0].x + pipes[0].w <= 0:
+                spare_pipes.append(pipes.popleft()) # Recycle pipes that left the screen
 
             if background.x <= -BACKGROUND_WIDTH:
                 background.x = 0
 
-            background.draw_background(display_surface, bg_image, background.x, background.y)
-            background.draw_background(display_surface, bg_image, background.x + BACKGROUND_WIDTH, background.y)
-            background.move() # Move and draw the background to create a continuous loop
-
             for player in players:
                 if player.y >= SCREEN_HEIGHT or player.y + player.h <= 0:
                     game_state = "DEAD" # Check if players left the screen
 
             for pipe in pipes:
-                pipe.move()
-                pipe.draw_pipe_upper(display_surface, pipe_upper)
-                pipe.draw_pipe_lower(display_surface, pipe_lower)
-                upper_rect, lower_rect = pipe.get_rect()
-
+                pipe.x -= PIPE_SPEED # Inlined Pipe.move()
                 for player in players:
-                    if player.get_rect().colliderect(upper_rect) or player.get_rect().colliderect(lower_rect):
-                        game_state = "DEAD" #Check if players collided with any pipe
                     if player.x > pipe.x + pipe.w and not pipe.cleared:
                         player.score += 1
                         pipe.cleared = True # Update score and cleared status of pipes.
 
-            draw_text_outline(display_surface, f"SCORE: {players[0].score:.0f}", 32, (SCREEN_WIDTH//2, 30), WHITE) # Draw score
+            # Pipes are spaced wider than a pipe plus a bird, so at most one overlaps the birds horizontally
+            bird_left, bird_right = START_COORDS[0], START_COORDS[0] + BIRD_SIZE[0]
+            candidate = next((pipe for pipe in pipes if pipe.x < bird_right and pipe.x + pipe.w > bird_left), None)
+            if candidate is not None:
+                for player in players:
+                    bird_top = int(player.y) # Hitboxes are whole pixels, as with the pygame.Rect they replaced
+                    if bird_top < PIPE_HITBOX_BOTTOM and (bird_top < candidate.h or bird_top + player.h > candidate.gap_bottom):
+                        game_state = "DEAD" #Check if players collided with the pipe
 
             for player in players:
-                player.time_diff()
-                player.gravity()
-                player.draw_bird(display_surface, bird_image)
+                # Inlined Bird.gravity()
+                player.air_ticks += 1
+                player.vel -= GRAVITY_PER_TICK * player.air_ticks
+                player.y -= player.vel
+
+            # Draw background, pipes and birds in one batched call (pipe images are offset to match their hitboxes)
+            # Sprites that are entirely off-screen are left out
+            draw_list = [
+                (bg_image, (bg_x, background.y)) for bg_x in (background.x, background.x + BACKGROUND_WIDTH)
+                if -BACKGROUND_WIDTH < bg_x < SCREEN_WIDTH
+            ]
+            visible_pipes = [pipe for pipe in pipes if pipe.x + pipe_draw_left < SCREEN_WIDTH and pipe.x + pipe_draw_right > 0]
+            draw_list += [(pipe_upper, (pipe.x + upper_dx, pipe.h + upper_dy)) for pipe in visible_pipes]
+            draw_list += [(pipe_lower, (pipe.x + lower_dx, pipe.h + pipe.gap + lower_dy)) for pipe in visible_pipes]
+            draw_list += [
+                (bird_image, (player.x + bird_dx, player.y + bird_dy)) for player in players
+                if -bird_image.get_height() < player.y + bird_dy < SCREEN_HEIGHT
+            ]
+            blit_batch(display_surface, draw_list)
+            background.move() # Move the background to create a continuous loop
+
+            draw_text_outline(display_surface, f"SCORE: {players[0].score:.0f}", 32, (SCREEN_WIDTH//2, 30), WHITE) # Draw score
 
         elif game_state == "DEAD":
             draw_text_outline(display_surface, "OH DEAR! YOU LOST", 36, (SCREEN_WIDTH//2, 300), WHITE)
@@ -241,7 +302,7 @@ def main() -> None:
             draw_text_outline(display_surface, "Press R to Restart", 24, (SCREEN_WIDTH//2, 570), WHITE)
 
         pygame.display.update()
-        clock.tick(FPS)
+        next_deadline = wait_for_deadline(next_deadline)
 
 
 if __name__ == "__main__":
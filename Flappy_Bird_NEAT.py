@@ -1,9 +1,20 @@
+import argparse
+import functools
+import math
 import random
+import time
 import pygame
 from pygame.locals import *
 import neat
+import numpy as np
+try:
+    from numba import njit
+except ImportError: # numba is optional, the NumPy version of the bird step is used without it
+    njit = None
 import os
-from typing import List, Tuple
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Tuple
 
 # COLOR CONSTANTS
 BLACK = (0, 0, 0)
@@ -19,80 +30,116 @@ JUMP_VELOCITY = 8
 PIPE_SPEED = 5
 PIPE_WIDTH = 150
 PIPE_GAP = 165
+PIPE_POOL_SIZE = 4 # At most three pipes are on screen at once
 PIPE_LOWER_LIM, PIPE_UPPER_LIM = (200, 600)
 
 SCREEN_WIDTH = 600
 SCREEN_HEIGHT = 800
+PIPE_HITBOX_BOTTOM = SCREEN_HEIGHT - 3 # The lower pipe hitbox stops 3px above the bottom of the screen
 FPS = 30
+DT = 1 / FPS # Fixed simulation step, the loop is paced to FPS
+GRAVITY_PER_TICK = GRAVITY_ACCEL * DT
 BACKGROUND_WIDTH = 880
 BACKGROUND_SPEED = 3
 
-class Bird:
-    """Represents the bird agent in the Flappy Bird game."""
-    def __init__(self):
-        self.x, self.y = START_COORDS
-        self.w, self.h = BIRD_SIZE
-        self.accel = GRAVITY_ACCEL
-        self.vel = JUMP_VELOCITY
-        self.time_ini = 0
-        self.time_elapsed = 0
-        self.score = 0
-        self.alive = True
-
-    def time_init(self) -> None:
-        """Initialize time marker for gravity calculations."""
-        self.time_ini = pygame.time.get_ticks()
-
-    def time_diff(self) -> None:
-        """Update time elapsed since last jump."""
-        self.time_elapsed = (pygame.time.get_ticks() - self.time_ini) / 1000
-
-    def gravity(self) -> None:
-        """Apply gravity to the bird's position."""
-        self.vel -= self.accel * self.time_elapsed
-        self.y -= self.vel
-
-    def jump(self) -> None:
-        """Simulate a jump by resetting velocity and time."""
-        self.time_init()
-        self.vel = JUMP_VELOCITY
-
-    def draw_bird(self, surface: pygame.Surface, image: pygame.Surface) -> None:
-        """Draw the bird image on the surface."""
-        surface.blit(image, [self.x - 10, self.y - 3])
-
-    def get_rect(self) -> pygame.Rect:
-        """Return the bird's rectangular hitbox."""
-        return pygame.Rect(self.x, self.y, self.w, self.h)
+def _step_birds_loop(ys: np.ndarray, vels: np.ndarray, air_ticks: np.ndarray, alive: np.ndarray, fitnesses: np.ndarray,
+                     check_pipe: bool, gap_top: float, gap_bottom: float) -> None:
+    """
+    Kill birds that left the screen or hit the pipe, then apply gravity to the rest (explicit loop for numba).
+    """
+    for i in range(ys.shape[0]):
+        if not alive[i]:
+            continue
+        dead = False
+        if ys[i] >= SCREEN_HEIGHT or ys[i] + BIRD_SIZE[1] <= 0:
+            fitnesses[i] -= 10 # Punish players for going out the screen
+            dead = True
+        elif check_pipe:
+            top = int(ys[i]) # Hitboxes are whole pixels, as with the pygame.Rect they replaced
+            if top < PIPE_HITBOX_BOTTOM and (top < gap_top or top + BIRD_SIZE[1] > gap_bottom):
+                fitnesses[i] -= 10 # Punish players for dying to a pipe
+                dead = True
+        if dead:
+            alive[i] = False
+            continue
+        air_ticks[i] += 1
+        vels[i] -= GRAVITY_PER_TICK * air_ticks[i]
+        ys[i] -= vels[i]
+        fitnesses[i] += 0.1 # Reward the players minimally for surviving one tick
+
+
+def _step_birds_numpy(ys: np.ndarray, vels: np.ndarray, air_ticks: np.ndarray, alive: np.ndarray, fitnesses: np.ndarray,
+                      check_pipe: bool, gap_top: float, gap_bottom: float) -> None:
+    """
+    Kill birds that left the screen or hit the pipe, then apply gravity to the rest (vectorized fallback).
+    """
+    dead = alive & ((ys >= SCREEN_HEIGHT) | (ys + BIRD_SIZE[1] <= 0))
+    fitnesses[dead] -= 10 # Punish players for going out the screen
+    if check_pipe:
+        tops = ys.astype(np.int64) # Hitboxes are whole pixels, as with the pygame.Rect they replaced
+        hit = alive & ~dead & (tops < PIPE_HITBOX_BOTTOM) & ((tops < gap_top) | (tops + BIRD_SIZE[1] > gap_bottom))
+        fitnesses[hit] -= 10 # Punish players for dying to a pipe
+        dead |= hit
+    alive &= ~dead
+
+    air_ticks[alive] += 1
+    vels[alive] -= GRAVITY_PER_TICK * air_ticks[alive]
+    ys[alive] -= vels[alive]
+    fitnesses[alive] += 0.1 # Reward the players minimally for surviving one tick
+
+
+step_birds = njit(_step_birds_loop) if njit is not None else _step_birds_numpy
+
+
+@dataclass
+class BirdPool:
+    """Holds the state of every bird agent as parallel NumPy arrays, one entry per genome."""
+    ys: np.ndarray
+    vels: np.ndarray
+    air_ticks: np.ndarray # Ticks since each bird's last jump
+    alive: np.ndarray
+    scores: np.ndarray
+
+    @classmethod
+    def spawn(cls, count: int) -> "BirdPool":
+        """Create count birds at the starting position."""
+        return cls(
+            ys=np.full(count, float(START_COORDS[1])),
+            vels=np.full(count, float(JUMP_VELOCITY)),
+            air_ticks=np.zeros(count, dtype=np.int64),
+            alive=np.ones(count, dtype=bool),
+            scores=np.zeros(count, dtype=np.int32)
+        )
+
+    def step(self, fitnesses: np.ndarray, check_pipe: bool, gap_top: float, gap_bottom: float) -> None:
+        """Advance every live bird one tick, checking the pipe gap when check_pipe is set."""
+        step_birds(self.ys, self.vels, self.air_ticks, self.alive, fitnesses, check_pipe, float(gap_top), float(gap_bottom))
+
+    def jump(self, idx: np.ndarray) -> None:
+        """Simulate a jump for the birds selected by idx (indices or a boolean mask)."""
+        self.vels[idx] = JUMP_VELOCITY
+        self.air_ticks[idx] = 0
 
 
 class Pipe:
     """Represents a pipe obstacle in the game."""
-    def __init__(self, x: int):
-        self.x, self.y = (x, 0)
-        self.w, self.h = (PIPE_WIDTH, random.randint(PIPE_LOWER_LIM, PIPE_UPPER_LIM))
+    def __init__(self):
+        self.y = 0
+        self.w = PIPE_WIDTH
         self.gap = PIPE_GAP
+        # The position and height are set by reset() when the pipe is taken from the pool
+
+    def reset(self, x: int) -> None:
+        """Place the pipe at x with a new random height so it can be reused."""
+        self.x = x
+        self.h = random.randint(PIPE_LOWER_LIM, PIPE_UPPER_LIM)
+        self.gap_bottom = self.h + self.gap - 3  # The lower hitbox starts 3px above the gap
         self.cleared = False
 
     def move(self) -> None:
         """Move the pipe leftward."""
         self.x -= PIPE_SPEED
 
-    def draw_pipe_upper(self, surface: pygame.Surface, image: pygame.Surface) -> None:
-        """Draw the top pipe on a given surface."""
-        surface.blit(image, [self.x - 8, self.h - 552])
-
-    def draw_pipe_lower(self, surface: pygame.Surface, image: pygame.Surface) -> None:
-        """Draw the bottom pipe on a given surface."""
-        surface.blit(image, [self.x - 8, self.h + self.gap - 28])
-
-    def get_rect(self) -> Tuple[pygame.Rect, pygame.Rect]:
-        """Return both top and bottom pipe rectangles for collision detection."""
-        return (
-            pygame.Rect(self.x, self.y, self.w, self.h),
-            pygame.Rect(self.x, self.h + self.gap - 3, self.w, SCREEN_HEIGHT - (self.h + self.gap))
-        )
-
 
 class Background:
     """Handles background scrolling."""
@@ -104,9 +151,122 @@ class Background:
         """Scroll the background left."""
         self.x -= BACKGROUND_SPEED
 
-    def draw_background(self, surface: pygame.Surface, image: pygame.Surface, x: int, y: int) -> None:
-        """Draw the background at a given location."""
-        surface.blit(image, [x, y])
+
+def compile_network(network: neat.nn.FeedForwardNetwork) -> Callable[[float, float, float, float], float]:
+    """
+    Generate a straight-line Python function computing the same output as network.activate().
+    """
+    names = dict(zip(network.input_nodes, ["y", "distance", "top", "bottom"]))
+    namespace = {"tanh": math.tanh}
+    lines = ["def activate(y, distance, top, bottom):"]
+    for idx, (node, act_func, agg_func, bias, response, links) in enumerate(network.node_evals):
+        names[node] = f"v{idx}"
+        terms = [f"{names[input_key]} * {weight!r}" for input_key, weight in links]
+        if agg_func is neat.aggregations.sum_aggregation:
+            aggregated = " + ".join(terms) or "0"
+        else:
+            namespace[f"agg{idx}"] = agg_func
+            aggregated = f"agg{idx}([{', '.join(terms)}])"
+        z = f"{bias!r} + {response!r} * ({aggregated})"
+        if act_func is neat.activations.tanh_activation:
+            lines.append(f"    v{idx} = tanh(2.5 * ({z}))") # Clamping as neat does would not change the result
+        else:
+            namespace[f"act{idx}"] = act_func
+            lines.append(f"    v{idx} = act{idx}({z})")
+    lines.append(f"    return {names.get(network.output_nodes[0], '0.0')}")
+
+    exec("\n".join(lines), namespace)
+    return namespace["activate"]
+
+
+class NetworkBatch:
+    """
+    Evaluates the networks of a generation together.
+
+    Networks whose output only reads the inputs reduce to tanh(bias + response * weights . inputs) and are
+    evaluated for every bird with one NumPy product; networks routing through hidden nodes fall back to
+    a straight-line function generated by compile_network().
+    """
+    def __init__(self, networks: List[neat.nn.FeedForwardNetwork]):
+        self.compiled = [None] * len(networks)
+        self.weights = np.zeros((len(networks), 4))
+        self.biases = np.zeros(len(networks))
+        self.responses = np.zeros(len(networks))
+        self.direct = np.ones(len(networks), dtype=bool)
+
+        for idx, network in enumerate(networks):
+            output_evals = [node_eval for node_eval in network.node_evals if node_eval[0] in network.output_nodes]
+            if not output_evals:
+                continue # The output node is never evaluated, so it stays at 0.0
+            _, act_func, agg_func, bias, response, links = output_evals[0]
+            if (act_func is not neat.activations.tanh_activation or agg_func is not neat.aggregations.sum_aggregation
+                    or any(input_key not in network.input_nodes for input_key, _ in links)):
+                self.direct[idx] = False
+                self.compiled[idx] = compile_network(network)
+                continue
+            for input_key, weight in links:
+                self.weights[idx, network.input_nodes.index(input_key)] = weight
+            self.biases[idx] = bias
+            self.responses[idx] = response
+
+    def activate(self, inputs: np.ndarray, live_idx: np.ndarray) -> np.ndarray:
+        """Return the output of the networks at live_idx for a (len(live_idx), 4) array of inputs."""
+        weighted_sum = (inputs * self.weights[live_idx]).sum(axis=1)
+        outputs = np.tanh(2.5 * (self.biases[live_idx] + self.responses[live_idx] * weighted_sum)) # Same scaling as neat's tanh_activation
+        for pos in np.flatnonzero(~self.direct[live_idx]):
+            outputs[pos] = self.compiled[live_idx[pos]](*inputs[pos])
+        return outputs
+
+
+def trim_image(image: pygame.Surface) -> Tuple[pygame.Surface, Tuple[int, int]]:
+    """
+    Crop the fully transparent border of an image, returning the cropped image and its offset.
+    """
+    bounds = image.get_bounding_rect()
+    return image.subsurface(bounds).copy(), bounds.topleft
+
+
+def blit_batch(surface: pygame.Surface, sequence: List[Tuple[pygame.Surface, Tuple[int, int]]]) -> None:
+    """
+    Draw a sequence of (image, position) pairs on a surface in a single call.
+    """
+    if hasattr(surface, "fblits"):
+        surface.fblits(sequence) # pygame-ce fast path
+    else:
+        surface.blits(sequence, doreturn=0)
+
+
+_font_cache: Dict[Tuple[str, int], pygame.font.Font] = {}
+
+
+def _get_font(font_name: str, size: int) -> pygame.font.Font:
+    """
+    Return the Font for a name and size, loading it on first use.
+    """
+    key = (font_name, size)
+    if key not in _font_cache:
+        _font_cache[key] = pygame.font.Font(font_name, size)
+    return _font_cache[key]
+
+
+@functools.lru_cache(maxsize=128)
+def _render_text(text: str, size: int, text_color: Tuple[int, int, int], outline_color: Tuple[int, int, int],
+                 font_name: str, outline_thickness: int) -> pygame.Surface:
+    """
+    Render outlined text once onto a transparent surface and cache the result.
+    """
+    font = _get_font(font_name, size)
+    outline_surf = font.render(text, True, outline_color)
+    width, height = outline_surf.get_size()
+    outlined = pygame.Surface((width + 2 * outline_thickness, height + 2 * outline_thickness), SRCALPHA)
+    offsets = [-outline_thickness, 0, outline_thickness]
+    blit_batch(outlined, [
+        (outline_surf, (outline_thickness + dx, outline_thickness + dy))
+        for dx in offsets for dy in offsets if dx != 0 or dy != 0
+    ]) # The same outline render shifted in all 8 directions
+
+    outlined.blit(font.render(text, True, text_color), (outline_thickness, outline_thickness))
+    return outlined
 
 
 def draw_text_outline(surface: pygame.Surface, text: str, size: int, position: Tuple[int, int], text_color: Tuple[int, int, int],
@@ -114,33 +274,23 @@ def draw_text_outline(surface: pygame.Surface, text: str, size: int, position: T
     """
     Draw text with an outline.
     """
-    font = pygame.font.Font(font_name, size)
-    for dx in [-outline_thickness, 0, outline_thickness]:
-        for dy in [-outline_thickness, 0, outline_thickness]:
-            if dx != 0 or dy != 0:
-                outline_surf = font.render(text, True, outline_color)
-                outline_rect = outline_surf.get_rect(center=(position[0] + dx, position[1] + dy))
-                surface.blit(outline_surf, outline_rect)
-
-    text_surf = font.render(text, True, text_color)
-    text_rect = text_surf.get_rect(center=position)
-    surface.blit(text_surf, text_rect)
+    text_surf = _render_text(text, size, text_color, outline_color, font_name, outline_thickness)
+    surface.blit(text_surf, text_surf.get_rect(center=position))
 
 
-def event_handler(game_state: str, players: List[Bird], pipes: List[Pipe]) -> str:
+def event_handler(game_state: str, birds: BirdPool, pipes: Deque[Pipe]) -> str:
     """
     Handle user input and update the game state.
     """
-    for event in pygame.event.get():
+    for event in pygame.event.get([pygame.KEYDOWN, pygame.QUIT]):
+        if event.type == pygame.QUIT:
+            return "QUIT"
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE:
                 if game_state == "MENU":
-                    for player in players:
-                        player.time_init()
                     return "PLAY"
                 elif game_state == "PLAY":
-                    for player in players:
-                        player.jump()
+                    birds.jump(birds.alive)
             elif event.key == pygame.K_r and game_state == "DEAD":
                 return "MENU"
             elif event.key == pygame.K_q:
@@ -148,41 +298,73 @@ def event_handler(game_state: str, players: List[Bird], pipes: List[Pipe]) -> st
     return game_state
 
 
-def main(genomes: List[Tuple[int, neat.DefaultGenome]], config_file: neat.Config) -> None:
+def wait_for_deadline(deadline: float) -> float:
+    """
+    Sleep until the frame deadline and return the next one, skipping frames that were already missed.
+    """
+    now = time.perf_counter()
+    if now < deadline:
+        time.sleep(deadline - now)
+        return deadline + DT
+    return deadline + DT * ((now - deadline) // DT + 1) # Running behind: realign instead of rushing to catch up
+
+
+def main(genomes: List[Tuple[int, neat.DefaultGenome]], config_file: neat.Config, watch: bool = False) -> None:
     """
     Main NEAT training loop.
+
+    Without watch the generation is simulated headless: no window, no drawing and no frame limit.
     """
     neural_networks = []
     genome_objects = []
-    players = []
-    pipes = [Pipe(610)]
-    game_state = "MENU"
+    spare_pipes = [Pipe() for _ in range(PIPE_POOL_SIZE)]
+    pipes = deque([spare_pipes.pop()])
+    pipes[0].reset(610)
+    next_pipe_idx = 0 # Index of the first pipe the birds have not cleared yet
+    game_state = "MENU" if watch else "PLAY" # Headless runs have no keyboard to start the game with
 
     # Create networks, genomes and bird instances
     for _, genome in genomes:
         network = neat.nn.FeedForwardNetwork.create(genome, config_file)
         neural_networks.append(network)
-        players.append(Bird())
-        genome.fitness = 0 # Initializing each genome's fitness
         genome_objects.append(genome)
-
-    pygame.init()
-    displaySurface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption('FLAPPY BIRD')
-    clock = pygame.time.Clock()
-    
-    bg_image = pygame.image.load("./Images/bg_resize.png").convert()
-    bird_image = pygame.image.load("./Images/bird_resize.png").convert_alpha()
-    pipe_lower = pygame.image.load("./Images/pipe_lower.png").convert_alpha()
-    pipe_upper = pygame.image.load("./Images/pipe_upper.png").convert_alpha()
+    neural_networks = NetworkBatch(neural_networks)
+    birds = BirdPool.spawn(len(genome_objects))
+    fitnesses = np.zeros(len(genome_objects)) # Copied to the genomes once the generation ends
+    live_idx = np.flatnonzero(birds.alive) # Birds are never removed, dead ones are just left out of this array
+    bird_x = START_COORDS[0]
+    bird_w = BIRD_SIZE[0]
+
+    if watch:
+        pygame.init()
+        pygame.event.set_blocked(None) # Only queue the events the game reacts to
+        pygame.event.set_allowed([pygame.KEYDOWN, pygame.QUIT])
+        displaySurface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption('FLAPPY BIRD')
+        next_deadline = time.perf_counter() + DT
+
+        bg_image = pygame.image.load("./Images/bg_resize.png").convert()
+        if bg_image.get_size() != (BACKGROUND_WIDTH, SCREEN_HEIGHT):
+            bg_image = pygame.transform.scale(bg_image, (BACKGROUND_WIDTH, SCREEN_HEIGHT))
+        # Drop transparent margins so blits only copy visible pixels, folding the crop into the draw offsets
+        bird_image, (bird_dx, bird_dy) = trim_image(pygame.image.load("./Images/bird_resize.png").convert_alpha())
+        pipe_lower, (lower_dx, lower_dy) = trim_image(pygame.image.load("./Images/pipe_lower.png").convert_alpha())
+        pipe_upper, (upper_dx, upper_dy) = trim_image(pygame.image.load("./Images/pipe_upper.png").convert_alpha())
+        # Offsets that line the images up with the hitboxes
+        bird_dx, bird_dy = bird_dx - 10, bird_dy - 3
+        lower_dx, lower_dy = lower_dx - 8, lower_dy - 28
+        upper_dx, upper_dy = upper_dx - 8, upper_dy - 552
+        # Horizontal extent of the drawn pipe images relative to the hitbox, used to cull off-screen pipes
+        pipe_draw_left = min(upper_dx, lower_dx)
+        pipe_draw_right = max(upper_dx + pipe_upper.get_width(), lower_dx + pipe_lower.get_width())
     background = Background()
 
     while game_state != "QUIT":
-        game_state = event_handler(game_state, players, pipes)
+        if watch:
+            game_state = event_handler(game_state, birds, pipes)
 
         if game_state == "MENU":
-            background.draw_background(displaySurface, bg_image, background.x, background.y)
-            background.draw_background(displaySurface, bg_image, background.x + 880, background.y)
+            blit_batch(displaySurface, [(bg_image, (bg_x, background.y)) for bg_x in (background.x, background.x + 880) if -880 < bg_x < SCREEN_WIDTH])
             background.move()
             draw_text_outline(displaySurface, "FLAPPY BIRD NEUROEVOLUTION", 36, (SCREEN_WIDTH//2, 300), WHITE)
             draw_text_outline(displaySurface, "Press SPACE to start", 24, (SCREEN_WIDTH//2, 450), WHITE)
@@ -190,72 +372,86 @@ def main(genomes: List[Tuple[int, neat.DefaultGenome]], config_file: neat.Config
 
         elif game_state == "PLAY":
             if pipes[-1].x <= 250:
-                pipes.append(Pipe(610)) # Add pipes if current pipe reacher half of the screem
+                pipe = spare_pipes.pop()
+                pipe.reset(610)
+                pipes.append(pipe) # Add pipes if current pipe reacher half of the screem
 
-            pipes = [pipe for pipe in pipes if pipe.x + pipe.w > 0] # Clear pipes that left the screen
+            if pipes[0].x + pipes[0].w <= 0:
+                spare_pipes.append(pipes.popleft()) # Recycle pipes that left the screen
+                next_pipe_idx -= 1
             if background.x <= -880:
                 background.x = 0
 
-            background.draw_background(displaySurface, bg_image, background.x, background.y)
-            background.draw_background(displaySurface, bg_image, background.x + 880, background.y)
-            background.move()
-
             # Calculate the variables the birds will "see" to play the game
-            distance_next_pipe = min([pipe.x for pipe in pipes if not pipe.cleared]) - players[0].x #Calculate the distance of the bird til next pipe
-            next_pipe = [pipe for pipe in pipes if not pipe.cleared][0]
+            while next_pipe_idx < len(pipes) - 1 and pipes[next_pipe_idx].cleared:
+                next_pipe_idx += 1 # Pipes are cleared in order, so the index only moves forward
+            next_pipe = pipes[next_pipe_idx]
+            distance_next_pipe = next_pipe.x - START_COORDS[0] #Calculate the distance of the bird til next pipe
             next_top_pipe_y = next_pipe.h # Get the coming upper pipe's height
             next_bottom_pipe_y = next_pipe.h + next_pipe.gap # Get the coming lower pipe's height
 
-            for idx, player in enumerate(players):
-                if player.y >= SCREEN_HEIGHT or player.y + player.h <= 0:
-                    genome_objects[idx].fitness -= 10 # Punish players for going out the screen
-                    player.alive = False
-
             for pipe in pipes:
-                pipe.move()
-                pipe.draw_pipe_upper(displaySurface, pipe_upper)
-                pipe.draw_pipe_lower(displaySurface, pipe_lower)
-
-                pipe_collision_upper, pipe_collision_lower = pipe.get_rect()
-                for idx, player in enumerate(players):
-                    player_collision = player.get_rect()
-                    if player_collision.colliderect(pipe_collision_upper) or player_collision.colliderect(pipe_collision_lower):
-                        genome_objects[idx].fitness -= 10 # Punish players for dying to a pipe
-                        player.alive = False
-                    if player.x > pipe.x + pipe.w and not pipe.cleared:
-                        player.score += 1
-                        genome_objects[idx].fitness += 20 #Rewards players for clearing a ser of pipes.
-                        pipe.cleared = True
-
-            indexes_dead = [i for i, p in enumerate(players) if not p.alive] # Clear players that have been labeled as dead
-            for idx in sorted(indexes_dead, reverse=True):
-                players.pop(idx)
-                neural_networks.pop(idx)
-                genome_objects.pop(idx)
-
-            for idx, player in enumerate(players):
-                player.time_diff()
-                player.gravity()
-                player.draw_bird(displaySurface, bird_image)
-                genome_objects[idx].fitness += 0.1 # Reward the players minimally for surviving one tick
-                output = neural_networks[idx].activate((player.y, distance_next_pipe, next_top_pipe_y, next_bottom_pipe_y)) # Get the model's response to jumping depending on x values
-                if output[0] > 0.5: # Check if the model wants to jump
-                    player.jump()
-
-            if len(players) == 0:
+                pipe.x -= PIPE_SPEED # Inlined Pipe.move()
+
+            # Pipes left of next_pipe are already behind the birds and the following one is a full spacing
+            # further right, so next_pipe is the only pipe that can overlap the birds or be cleared this tick
+            overlaps_pipe = next_pipe.x < bird_x + bird_w and next_pipe.x + next_pipe.w > bird_x
+            if not overlaps_pipe and bird_x > next_pipe.x + next_pipe.w and not next_pipe.cleared and birds.alive.any():
+                first = np.argmax(birds.alive) # Only the first bird still flying gets the credit
+                birds.scores[first] += 1
+                fitnesses[first] += 20 #Rewards players for clearing a ser of pipes.
+                next_pipe.cleared = True
+
+            birds.step(fitnesses, overlaps_pipe, next_pipe.h, next_pipe.gap_bottom)
+            live_idx = np.flatnonzero(birds.alive) # Drop players that have been labeled as dead
+
+            # Only the height differs between birds, the pipe inputs are shared by all of them
+            inputs = np.empty((len(live_idx), 4))
+            inputs[:, 0] = birds.ys[live_idx]
+            inputs[:, 1:] = (distance_next_pipe, next_top_pipe_y, next_bottom_pipe_y)
+            outputs = neural_networks.activate(inputs, live_idx) # Get the models' response to jumping depending on x values
+            birds.jump(live_idx[outputs > 0.5]) # Jump for the models that want to
+
+            if len(live_idx) == 0:
                 game_state = "QUIT"
 
-            if genome_objects:
-                max_fit = [round(g.fitness, 1) for g in genome_objects] # Get the max fitness and draw it
-                draw_text_outline(displaySurface, f"Max Fitness: {max(max_fit):.1f} for {len(genome_objects)} alive birds", 32, (200, 30), WHITE)
+            if len(live_idx):
+                max_fitness = fitnesses[live_idx].max()
+                if max_fitness >= config_file.fitness_threshold:
+                    game_state = "QUIT" # End the generation once the goal is reached, headless runs can't be stopped by hand
+
+            if watch:
+                # Draw background, pipes and birds in one batched call, leaving out sprites that are entirely off-screen
+                draw_list = [(bg_image, (bg_x, background.y)) for bg_x in (background.x, background.x + 880) if -880 < bg_x < SCREEN_WIDTH]
+                visible_pipes = [pipe for pipe in pipes if pipe.x + pipe_draw_left < SCREEN_WIDTH and pipe.x + pipe_draw_right > 0]
+                draw_list += [(pipe_upper, (pipe.x + upper_dx, pipe.h + upper_dy)) for pipe in visible_pipes]
+                draw_list += [(pipe_lower, (pipe.x + lower_dx, pipe.h + pipe.gap + lower_dy)) for pipe in visible_pipes]
+                draw_list += [(bird_image, (bird_x + bird_dx, y + bird_dy)) for y in birds.ys[live_idx].tolist() if -bird_image.get_height() < y + bird_dy < SCREEN_HEIGHT]
+                blit_batch(displaySurface, draw_list)
+                background.move()
 
-        pygame.display.update()
-        clock.tick(FPS)
+                if len(live_idx):
+                    draw_text_outline(displaySurface, f"Max Fitness: {max_fitness:.1f} for {len(live_idx)} alive birds", 32, (200, 30), WHITE)
+
+        if watch:
+            pygame.display.update()
+            next_deadline = wait_for_deadline(next_deadline)
+
+    for genome, fitness in zip(genome_objects, fitnesses.tolist()):
+        genome.fitness = fitness
+
+
+def eval_genome(genome: neat.DefaultGenome, config_file: neat.Config) -> float:
+    """
+    Play a headless game with a single bird and return its fitness, for neat.ParallelEvaluator.
+    """
+    main([(genome.key, genome)], config_file)
+    return genome.fitness
 
 
 path_file: str = os.getcwd() + '/config-feedforward.txt'
 
-def run(file_path: str) -> None:
+def run(file_path: str, watch: bool = False) -> None:
     """
     Set up NEAT configuration and start the evolutionary training process.
     """
@@ -271,8 +467,14 @@ def run(file_path: str) -> None:
     population.add_reporter(neat.StdOutReporter(True))
     statistics = neat.StatisticsReporter()
     population.add_reporter(statistics)
-    winner = population.run(main, 10) # Run main game over generations
+    if watch:
+        fitness_function = functools.partial(main, watch=True) # One shared game so the whole generation is on screen
+    else:
+        fitness_function = neat.ParallelEvaluator(os.cpu_count(), eval_genome).evaluate # One headless game per genome, spread over all cores
+    winner = population.run(fitness_function, 10) # Run main game over generations
 
 
 if __name__ == "__main__":
-    run(path_file)
+    parser = argparse.ArgumentParser(description="Train Flappy Bird agents with NEAT.")
+    parser.add_argument("--watch", action="store_true", help="render the game in a window at normal speed while training")
+    run(path_file, parser.parse_args().watch)